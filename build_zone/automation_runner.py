@@ -3,11 +3,16 @@
 
 Usage:
   python build_zone/automation_runner.py --config myautomation.yaml [--dry-run] [--headless]
+  python build_zone/automation_runner.py --config automations/ other.yaml
+
+Several configs (or a directory of them) run concurrently on one asyncio loop.
 
 This runner supports a small set of actions: detect_image, notify, run_command.
 It dynamically loads `build_zone/main.py` to reuse screenshot + matching helpers.
 """
 import argparse
+import ast
+import asyncio
 import importlib.util
 import time
 import subprocess
@@ -16,35 +21,131 @@ import yaml
 from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional, Any
 import sys
-import pyautogui
-try:
-    import pygetwindow as gw
-except Exception:
-    gw = None
-    # we'll try xdotool/wmctrl fallback later
+import functools
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 import shlex
 from subprocess import PIPE
 import random
-try:
-    from jinja2 import Template, Environment, StrictUndefined
-    HAVE_JINJA = True
-except Exception:
-    HAVE_JINJA = False
+import hashlib
+import re
+import zlib
+
+
+# Heavy or display-bound modules are imported on first use so --dry-run and
+# config validation never pay for them.
+@functools.cache
+def _pyautogui():
+    import pyautogui
+    return pyautogui
+
+
+@functools.cache
+def _gw():
+    try:
+        import pygetwindow as gw
+    except Exception:
+        # we'll try Xlib/xdotool fallback later
+        return None
+    return gw
+
+
+# Optional accelerators below return None when the package is missing.
+@functools.cache
+def _mss():
+    try:
+        import mss
+    except Exception:
+        return None
+    return mss
+
+
+@functools.cache
+def _xlib_display():
+    try:
+        from Xlib import display
+    except Exception:
+        return None
+    return display
+
+
+@functools.cache
+def _xxhash():
+    try:
+        import xxhash
+    except Exception:
+        return None
+    return xxhash
+
+
+@functools.cache
+def _observer_cls():
+    try:
+        from watchdog.observers import Observer
+    except Exception:
+        return None
+    return Observer
+
+
+# seconds a resolved window bbox is reused before the window list is rescanned
+WINDOW_CACHE_TTL = 2.0
+# pyrDown halvings for the coarse matching pass (fewer for small templates)
+PYRAMID_LEVELS = 2
+VARS_PATH = Path(__file__).resolve().parent / "variables.yaml"
+# captured templates (interactive_capture writes here)
+DATA_DIR = Path(__file__).resolve().parent / "data"
+# libyaml's C loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# path -> (mtime_ns, parsed data), see load_yaml_cached
+_YAML_CACHE = {}
+
+
+def get_window_bbox_by_xlib(disp, title: str):
+    """Find window geometry via EWMH _NET_CLIENT_LIST on an open Xlib display.
+
+    Returns (left, top, width, height) or None. Runs in-process, no xdotool spawn.
+    """
+    try:
+        from Xlib import X
+        root = disp.screen().root
+        clients = root.get_full_property(disp.intern_atom("_NET_CLIENT_LIST"), X.AnyPropertyType)
+        if clients is None:
+            return None
+        net_wm_name = disp.intern_atom("_NET_WM_NAME")
+        utf8 = disp.intern_atom("UTF8_STRING")
+        needle = title.casefold()
+        for wid in clients.value:
+            win = disp.create_resource_object("window", wid)
+            prop = win.get_full_property(net_wm_name, utf8)
+            if prop is not None:
+                name = prop.value.decode("utf-8", "replace") if isinstance(prop.value, bytes) else str(prop.value)
+            else:
+                name = win.get_wm_name()
+                if isinstance(name, bytes):
+                    name = name.decode("latin-1")
+            if not name or needle not in name.casefold():
+                continue
+            geom = win.get_geometry()
+            # root's origin expressed in the window's coordinates is minus its absolute position
+            pos = win.translate_coords(root, 0, 0)
+            return (-pos.x, -pos.y, geom.width, geom.height)
+    except Exception:
+        return None
+    return None
 
 
 def get_window_bbox_by_xdotool(title: str):
     """Try to find window geometry using xdotool (Linux). Returns (left, top, width, height) or None."""
     try:
         # search window ids
-        cmd = f"xdotool search --name {shlex.quote(title)}"
-        p = subprocess.run(cmd, shell=True, stdout=PIPE, stderr=PIPE, text=True)
+        p = subprocess.run(["xdotool", "search", "--name", title], stdout=PIPE, stderr=PIPE, text=True)
         if p.returncode != 0 or not p.stdout.strip():
             return None
         win_id = p.stdout.strip().splitlines()[0]
         # get geometry
-        cmd2 = f"xdotool getwindowgeometry --shell {shlex.quote(win_id)}"
-        p2 = subprocess.run(cmd2, shell=True, stdout=PIPE, stderr=PIPE, text=True)
+        p2 = subprocess.run(["xdotool", "getwindowgeometry", "--shell", win_id], stdout=PIPE, stderr=PIPE, text=True)
         if p2.returncode != 0:
             return None
         geom = {}
@@ -63,27 +164,160 @@ def get_window_bbox_by_xdotool(title: str):
         return None
 
 
+def load_yaml_cached(path: Path):
+    """Parse a YAML file, reusing the previous result while its mtime is unchanged.
+
+    The returned object is shared by every caller; treat it as read-only.
+    """
+    mtime = path.stat().st_mtime_ns
+    hit = _YAML_CACHE.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    data = yaml.load(path.read_text(), Loader=_YamlLoader)
+    _YAML_CACHE[path] = (mtime, data)
+    return data
+
+
+_MAIN_MODULE_LOCK = threading.Lock()
+
+
 def load_main_module():
+    """build_zone/main.py, executed once per process so every runner shares its caches and pools."""
+    with _MAIN_MODULE_LOCK:
+        return _exec_main_module()
+
+
+@functools.cache
+def _exec_main_module():
     main_path = Path(__file__).resolve().parent / "main.py"
-    spec = importlib.util.spec_from_file_location("build_zone_main", str(main_path))
+    # inside the package main's relative imports resolve; as a script build_zone/ is on sys.path
+    name = f"{__package__}.main" if __package__ else "build_zone_main"
+    spec = importlib.util.spec_from_file_location(name, str(main_path))
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
     return mod
 
 
+# node types a condition may contain: names, literals (including tuple/list/dict/set
+# displays), comparisons and arithmetic.
+# Calls and attribute access are rejected so conditions cannot reach builtins.
+_COND_NODES = (
+    ast.Expression, ast.Name, ast.Load, ast.Constant, ast.Subscript,
+    ast.Tuple, ast.List, ast.Dict, ast.Set,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+)
+_COND_CACHE = {}
+
+
+def compile_cond(expr: str):
+    """Parse and compile a condition once. Returns a code object, or None if not allowed."""
+    try:
+        return _COND_CACHE[expr]
+    except KeyError:
+        pass
+    code = None
+    try:
+        tree = ast.parse(expr, mode="eval")
+        if all(isinstance(node, _COND_NODES) for node in ast.walk(tree)):
+            code = compile(tree, "<cond>", "eval")
+    except SyntaxError:
+        pass
+    _COND_CACHE[expr] = code
+    return code
+
+
 def eval_cond(expr: str, ctx: dict) -> bool:
     if not expr:
         return False
     expr = expr.strip()
-    if expr.lower() == "true":
+    lowered = expr.lower()
+    if lowered == "true":
         return True
+    if lowered in ("false", ""):
+        return False
+    code = compile_cond(expr)
+    if code is None:
+        return False
     try:
-        # safe-ish eval: no builtins, only ctx available
-        return bool(eval(expr, {}, ctx))
+        # no builtins, only ctx available
+        return bool(eval(code, {"__builtins__": {}}, ctx))
     except Exception:
         return False
 
 
+# {{ name }} or {{ vars.name }}; anything else in a template needs the engine
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(?:(vars)\.)?([A-Za-z_]\w*)\s*\}\}")
+
+
+def simple_format_spec(src: str):
+    """Rewrite a template that only substitutes plain names into a str.format spec.
+
+    "{{ vars.logo }} at {{ attempts }}" becomes "{vars[logo]} at {attempts}".
+    Returns None if src uses filters, expressions, tags or comments.
+    """
+    # split() yields text, scope, name, text, scope, name, ..., text
+    pieces = _PLACEHOLDER_RE.split(src)
+    spec = []
+    for i in range(0, len(pieces), 3):
+        text = pieces[i]
+        if "{{" in text or "{%" in text or "{#" in text:
+            return None
+        spec.append(text.replace("{", "{{").replace("}", "}}"))
+        if i + 2 < len(pieces):
+            scope, name = pieces[i + 1], pieces[i + 2]
+            spec.append("{%s[%s]}" % (scope, name) if scope else "{%s}" % name)
+    return "".join(spec)
+
+
+def frame_hash(arr) -> int:
+    """Cheap content hash of an image array (xxh3 if installed, else crc32)."""
+    xxhash = _xxhash()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(arr)
+    return zlib.crc32(arr)
+
+
+class _WakeHandler:
+    """watchdog handler: call wake() when variables.yaml or a file in data/ changes.
+
+    Runs on the observer thread, so wake must be thread-safe.
+    """
+    def __init__(self, wake):
+        self.wake = wake
+
+    def dispatch(self, event):
+        # "opened"/"closed_no_write" fire on plain reads, including our own
+        if event.is_directory or event.event_type not in ("created", "modified", "moved"):
+            return
+        for p in (event.src_path, getattr(event, "dest_path", "")):
+            if not p:
+                continue
+            p = Path(p)
+            if p == VARS_PATH or (p.parent == DATA_DIR and p.resolve() not in _OWN_WRITES):
+                self.wake()
+                return
+
+
+# files the runners write themselves (screenshots, annotated images); changes to
+# them must not wake the poll loop, or each annotated hit would skip the interval
+_OWN_WRITES = set()
+
+
+def note_own_write(path):
+    """Tell _WakeHandler to ignore changes to path."""
+    _OWN_WRITES.add(Path(path).resolve())
+
+
+class _SafeDict(dict):
+    """format_map mapping that leaves unknown {{ names }} in place."""
+    def __missing__(self, key):
+        return "{{ %s }}" % key
+
+
 class TargetModel(BaseModel):
     type: str
     value: str
@@ -117,13 +351,22 @@ class AutomationConfig(BaseModel):
     exit: Optional[dict] = None
 
 
+# an entry of config.actions resolved once per run
+PlannedAction = namedtuple("PlannedAction", "name type when params")
+
+
 class AutomationRunner:
     def __init__(self, cfg_path: Path, dry_run: bool = False, headless: bool = False):
         self.cfg_path = Path(cfg_path)
-        self.cfg = yaml.safe_load(self.cfg_path.read_text())
+        self.cfg = load_yaml_cached(self.cfg_path)
         self.dry_run = dry_run
         self.headless = headless or self.cfg.get("headless", False)
-        self.mod = load_main_module()
+        target = self.cfg.get("target") or {}
+        self.ttype = target.get("type", "url")
+        self.tvalue = target.get("value", "https://www.google.com")
+        self.screenshot_path = Path(self.cfg.get("screenshot", "build_zone/data/google.png"))
+        self.annotated_path = self.cfg.get("annotated")
+        note_own_write(self.screenshot_path)
 
         # state
         self.attempts = 0
@@ -132,398 +375,797 @@ class AutomationRunner:
         self.target_found = False
         # persistent browser driver (None until created)
         self.driver = None
+        # guards driver creation; preload_driver starts it on a background thread
+        self._driver_lock = threading.Lock()
+        self._driver_future = None
+        # persistent mss grabber and the frame captured this iteration, see _grab
+        self._sct = None
+        self._frame = None
+        self._frame_key = None
+        # image path -> {"mtime", "image", ...matching data}, see _image_entry
+        self._img_cache = {}
+        # grayscale pyramid of the last matched frame, see _gray_pyramid
+        self._gray_src = None
+        self._gray_pyr = None
+        # content hash of that frame and (template path, scales) -> (frame hash,
+        # template gray, result) so an unchanged screen skips matching, see _match_template
+        self._gray_hash = None
+        self._match_cache = {}
+        # Xlib display connection (False once opening it failed), see _x_display
+        self._xdisplay = None
+        # window title -> (resolved_at, bbox or None), see _resolve_bbox
+        self._win_cache = {}
+        # action type -> handler; register extra action types here
+        self._handlers = {
+            "detect_image": self._do_detect_image,
+            "notify": self._do_notify,
+            "run_command": self._do_run_command,
+            "click_selector": self._do_click_selector,
+            "keystroke": self._do_keystroke,
+            "click_image": self._do_click_image,
+            "reload_vars": self._do_reload_vars,
+        }
+        # single worker: selenium/pyautogui calls for this runner stay on one thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="automation")
+        # set when watched files change so the poll loop wakes before interval, see _watch
+        self._wake = None
+        self._observer = None
         # load variables (from interactive_capture)
         self.variables = {}
-        vars_path = Path(__file__).resolve().parent / "variables.yaml"
-        if vars_path.exists():
+        if VARS_PATH.exists():
             try:
-                self.variables = yaml.safe_load(vars_path.read_text()) or {}
+                self.variables = load_yaml_cached(VARS_PATH) or {}
             except Exception:
                 self.variables = {}
-        # jinja environment
-        if HAVE_JINJA:
-            self.jinja_env = Environment(undefined=StrictUndefined)
-        else:
-            self.jinja_env = None
+        # compiled templates keyed by source string; the environment is created lazily
+        self._minijinja = False
+        self._tpl_cache = {}
+        # (id(driver), css selector) -> WebElement, see _find
+        self._el_cache = {}
+        # static run_command string -> shlex-split argv, filled by validate()
+        self._argv_cache = {}
+
+    @functools.cached_property
+    def mod(self):
+        """build_zone/main.py (cv2, numpy, selenium helpers), loaded on first use."""
+        return load_main_module()
+
+    @functools.cached_property
+    def jinja_env(self):
+        """Param template environment: minijinja if installed, else Jinja2, else None."""
+        # minijinja (Rust) renders the same {{ }} syntax faster; preferred when installed
+        try:
+            from minijinja import Environment as MiniJinjaEnvironment
+            self._minijinja = True
+            return MiniJinjaEnvironment(undefined_behavior="strict")
+        except Exception:
+            pass
+        try:
+            from jinja2 import Environment, StrictUndefined
+            return Environment(undefined=StrictUndefined)
+        except Exception:
+            return None
 
     def validate(self):
         try:
             self.typed = AutomationConfig(**self.cfg)
         except ValidationError as e:
             raise ValueError(f"config validation failed: {e}")
+        # precompile conditions and templated params so the polling loop only evaluates
+        # a rejected condition would silently evaluate to False on every cycle
+        for action in self.typed.actions:
+            when = (action.when or "").strip()
+            if when and compile_cond(when) is None:
+                raise ValueError(f"action {action.name}: condition not allowed or invalid: {when!r}")
+        for exit_name, exit_block in (self.typed.exit or {}).items():
+            if isinstance(exit_block, dict):
+                cond = str(exit_block.get("condition", "")).strip()
+                if cond and compile_cond(cond) is None:
+                    raise ValueError(f"exit {exit_name}: condition not allowed or invalid: {cond!r}")
+        # commands without templating can be split ahead of the first run
+        for action in self.typed.actions:
+            params = action.params or {}
+            cmd = params.get("command")
+            if action.type != "run_command" or params.get("shell") or not isinstance(cmd, str):
+                continue
+            if "{{" not in cmd and not cmd.strip().startswith("alert("):
+                try:
+                    self._argv_cache[cmd] = shlex.split(cmd)
+                except ValueError as e:
+                    raise ValueError(f"action {action.name}: cannot parse command: {e}")
+        if not self.dry_run and self.jinja_env is not None:
+            for action in self.typed.actions:
+                for v in (action.params or {}).values():
+                    if isinstance(v, str) and "{{" in v:
+                        try:
+                            self._get_template(v)
+                        except Exception:
+                            # bad syntax falls back to the raw string at render time
+                            pass
 
     def dry(self):
         print("Dry run: planned automation steps")
         print(yaml.dump(self.cfg))
 
-    def run(self):
-        polling = self.cfg.get("polling", {})
+    def _resolve_bbox(self, title: str):
+        """Return (left, top, width, height) of the first window whose title contains title.
+
+        Lookups (including misses) are cached for WINDOW_CACHE_TTL seconds so the
+        window list is scanned, and xdotool spawned, at most once per TTL.
+        """
+        now = time.monotonic()
+        hit = self._win_cache.get(title)
+        if hit and now - hit[0] < WINDOW_CACHE_TTL:
+            return hit[1]
+        bbox = None
+        gw = _gw()
+        if gw:
+            needle = title.casefold()
+            bbox = next(
+                ((w.left, w.top, w.width, w.height) for w in gw.getAllWindows() if w.title and needle in w.title.casefold()),
+                None,
+            )
+        if bbox is None:
+            disp = self._x_display()
+            if disp is not None:
+                bbox = get_window_bbox_by_xlib(disp, title)
+            else:
+                # try xdotool fallback on Linux
+                bbox = get_window_bbox_by_xdotool(title)
+        self._win_cache[title] = (now, bbox)
+        return bbox
+
+    def _x_display(self):
+        """Return the runner's Xlib display connection, or None without python-xlib / an X server."""
+        if self._xdisplay is None:
+            self._xdisplay = False
+            xdisplay = _xlib_display()
+            if xdisplay is not None:
+                try:
+                    self._xdisplay = xdisplay.Display()
+                except Exception:
+                    pass
+        return self._xdisplay or None
+
+    def _grab(self, bbox=None):
+        """Capture bbox (or the whole screen) as a BGR array.
+
+        The frame is reused for the rest of the polling iteration, so detect_image
+        and click_image on the same window only capture once.
+        """
+        key = (self.attempts, bbox)
+        if self._frame_key == key:
+            return self._frame
+        cv2, np = self.mod.cv2, self.mod.np
+        mss = _mss()
+        if mss is not None:
+            if self._sct is None:
+                self._sct = mss.mss()
+            if bbox:
+                monitor = {"left": bbox[0], "top": bbox[1], "width": bbox[2], "height": bbox[3]}
+            else:
+                monitor = self._sct.monitors[0]
+            # mss exposes its BGRA buffer through the array interface; dropping the
+            # alpha plane is a view, so the frame is never copied or colour-converted
+            frame = np.asarray(self._sct.grab(monitor))[:, :, :3]
+        else:
+            pyautogui = _pyautogui()
+            rgb = np.array(pyautogui.screenshot(region=bbox) if bbox else pyautogui.screenshot())
+            frame = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        self._frame = frame
+        self._frame_key = key
+        return self._frame
+
+    def _image_entry(self, path: Path):
+        """Return the cache entry for path, decoding it once per mtime; None if unreadable.
+
+        Entries hold the decoded BGR "image" plus derived matching data (see
+        _load_template) that is dropped whenever the file changes.
+        """
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        entry = self._img_cache.get(path)
+        if entry and entry["mtime"] == mtime:
+            return entry
+        arr = self.mod.cv2.imread(str(path))
+        if arr is None:
+            return None
+        entry = {"mtime": mtime, "image": arr, "scaled": {}}
+        self._img_cache[path] = entry
+        return entry
+
+    def _load_image(self, path: Path):
+        """Decode an image once per (path, mtime); returns None if it can't be read.
+
+        Returned arrays are shared between actions and iterations; copy before drawing on them.
+        """
+        entry = self._image_entry(path)
+        return entry["image"] if entry else None
+
+    def _load_template(self, path: Path, scales=None):
+        """Return the cache entry for a template with its matching data prepared.
+
+        Adds the grayscale copy, its pyramid ("levels", "pyramid") and the coarse
+        level resized to each scale set ("scaled"); all computed once per file version.
+        """
+        entry = self._image_entry(path)
+        if entry is None:
+            return None
+        cv2 = self.mod.cv2
+        if "gray" not in entry:
+            entry["gray"] = cv2.cvtColor(entry["image"], cv2.COLOR_BGR2GRAY)
+            entry["levels"] = self.mod.pyramid_levels(entry["gray"], PYRAMID_LEVELS)
+            entry["pyramid"] = self.mod.build_pyramid(entry["gray"], entry["levels"])
+        key = tuple(scales) if scales is not None else None
+        if key not in entry["scaled"]:
+            entry["scaled"][key] = self.mod.scale_template(entry["pyramid"][-1], scales)
+        return entry
+
+    def _gray_pyramid(self, img, levels: int):
+        """Grayscale pyramid of img, reused while the same frame object is matched again."""
+        if self._gray_src is not img:
+            gray = self.mod.cv2.cvtColor(img, self.mod.cv2.COLOR_BGR2GRAY)
+            self._gray_pyr = [gray]
+            self._gray_src = img
+            self._gray_hash = frame_hash(gray)
+        if len(self._gray_pyr) <= levels:
+            self._gray_pyr = self.mod.build_pyramid(self._gray_pyr[0], levels)
+        return self._gray_pyr[:levels + 1]
+
+    def _match_template(self, img, template_path: Path, scales=None):
+        """Coarse-to-fine grayscale match of a cached template against img.
+
+        Scales are swept on the pyramid's smallest level, then refined in a small
+        full-resolution ROI. The result is reused while neither the frame content
+        nor the template changes. Returns (best_val, best_loc, (w, h)) or None
+        when the template can't be read.
+        """
+        tpl = self._load_template(template_path, scales)
+        if tpl is None:
+            return None
+        key = tuple(scales) if scales is not None else None
+        frame_pyr = self._gray_pyramid(img, tpl["levels"])
+        # same pixels and same template as last time: the answer can't have changed
+        hit = self._match_cache.get((template_path, key))
+        if hit and hit[0] == self._gray_hash and hit[1] is tpl["gray"]:
+            return hit[2]
+        if self.mod.cuda_enabled():
+            # full-resolution sweep on the GPU; main keeps the frame and templates uploaded
+            result = self.mod.multi_scale_template_match(frame_pyr[0], tpl["gray"], scales=scales)
+        elif tpl["levels"] == 0:
+            result = self.mod.multi_scale_template_match(frame_pyr[0], tpl["gray"], scaled_templates=tpl["scaled"][key])
+        else:
+            approx = self.mod.match_pyramid(frame_pyr, tpl["pyramid"], scaled_templates=tpl["scaled"][key])
+            if approx[1] is None:
+                result = approx[:3]
+            else:
+                result = self.mod.refine_match(frame_pyr[0], tpl["gray"], approx)
+        self._match_cache[(template_path, key)] = (self._gray_hash, tpl["gray"], result)
+        return result
+
+    def _get_template(self, src: str):
+        """Return (kind, compiled) for src, compiling it on first use.
+
+        Plain name substitutions become ("fmt", spec) for str.format_map. Everything
+        else goes to the engine: with minijinja the parsed template lives in the
+        environment and the cache holds its name (sha1 of the source); with Jinja2
+        it holds the Template.
+        """
+        entry = self._tpl_cache.get(src)
+        if entry is None:
+            spec = simple_format_spec(src)
+            if spec is not None:
+                entry = ("fmt", spec)
+            elif self._minijinja:
+                name = hashlib.sha1(src.encode("utf-8")).hexdigest()
+                self.jinja_env.add_template(name, src)
+                entry = ("minijinja", name)
+            else:
+                entry = ("jinja", self.jinja_env.from_string(src))
+            self._tpl_cache[src] = entry
+        return entry
+
+    def render_param(self, v):
+        """Render a param using minijinja/Jinja2 if available, else fallback to simple replacement."""
+        if not isinstance(v, str) or "{{" not in v:
+            return v
+        if self.jinja_env is not None:
+            try:
+                kind, tpl = self._get_template(v)
+                ctx = {"vars": self.variables, "last_match_score": self.last_match_score, "attempts": self.attempts}
+                if kind == "fmt":
+                    # strict like the engines: a missing name leaves the param unrendered
+                    return tpl.format_map(ctx)
+                if kind == "minijinja":
+                    return self.jinja_env.render_template(tpl, **ctx)
+                return tpl.render(**ctx)
+            except Exception:
+                return v
+        # fallback simple replacement of top-level variable names
+        spec = self._tpl_cache.get(v)
+        if spec is None:
+            spec = self._tpl_cache[v] = simple_format_spec(v) or False
+        if not spec:
+            return v
+        try:
+            return spec.format_map(_SafeDict(self.variables))
+        except Exception:
+            return v
+
+    async def run(self):
+        """Poll the target until an exit condition is met.
+
+        Blocking work (selenium, screenshots, subprocesses) is pushed onto the
+        runner's executor so several runners can share one event loop.
+        """
+        polling = self.cfg.get("polling") or {}
+        timeout = polling.get("timeout_seconds")
+        try:
+            if timeout:
+                await asyncio.wait_for(self._poll(), timeout=timeout)
+            else:
+                await self._poll()
+        except asyncio.TimeoutError:
+            print(f"Polling timeout ({timeout}s) reached; stopping")
+        finally:
+            # cleanup persistent driver and grabber if present
+            if self._driver_future is not None:
+                await self._in_executor(self._claim_preloaded_driver)
+            if self.driver:
+                try:
+                    await self._in_executor(self.driver.quit)
+                except Exception:
+                    pass
+                self.mod.remove_profile(getattr(self.driver, "profile_dir", None))
+            if self._sct is not None:
+                await self._in_executor(self._sct.close)
+            if self._xdisplay:
+                await self._in_executor(self._xdisplay.close)
+            if self._observer is not None:
+                self._observer.stop()
+            self._executor.shutdown(wait=False)
+
+    async def _in_executor(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _watch(self):
+        """Start a watchdog observer (inotify on Linux) for variables.yaml and data/.
+
+        Changes set self._wake, so a reload_vars action or a re-captured template
+        is picked up right away instead of after a full polling interval.
+        """
+        self._wake = asyncio.Event()
+        Observer = _observer_cls()
+        if Observer is None:
+            return
+        loop = asyncio.get_running_loop()
+        handler = _WakeHandler(lambda: loop.call_soon_threadsafe(self._wake.set))
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(handler, str(VARS_PATH.parent), recursive=False)
+            if DATA_DIR.is_dir():
+                observer.schedule(handler, str(DATA_DIR), recursive=False)
+            observer.start()
+        except Exception as e:
+            print(f"file watching unavailable: {e}")
+            return
+        self._observer = observer
+
+    async def _sleep(self, interval):
+        """Sleep for interval seconds, or less if a watched file changes."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            # a save is usually several events; let the burst settle before clearing
+            await asyncio.sleep(0.1)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def _cond_ctx(self, elapsed: float, max_attempts: int) -> dict:
+        """Names available to action 'when' and exit conditions."""
+        return {
+            "last_match_score": self.last_match_score,
+            "attempts": self.attempts,
+            "max_attempts": max_attempts,
+            "elapsed_seconds": elapsed,
+            "target_found": self.target_found,
+            "vars": self.variables,
+        }
+
+    async def _poll(self):
+        # config is fixed for the run: resolve everything the loop needs once
+        polling = self.cfg.get("polling") or {}
         interval = polling.get("interval_seconds", 10)
         max_attempts = polling.get("max_attempts", 0) or 0
+        exit_cfg = self.cfg.get("exit") or {}
+        on_success = exit_cfg.get("on_success")
+        on_timeout = exit_cfg.get("on_timeout")
+        plan = [
+            PlannedAction(a.get("name"), a.get("type"), (a.get("when", "true") or "").strip(), a.get("params") or {})
+            for a in self.cfg.get("actions", [])
+        ]
+        self._watch()
 
         while True:
             self.attempts += 1
             elapsed = time.time() - self.start_time
-            # target type
-            target = self.cfg.get("target", {})
-            ttype = target.get("type", "url")
 
             # capture / detection
-            for action in self.cfg.get("actions", []):
-                when = action.get("when", "true")
-                ctx = {
-                    "last_match_score": self.last_match_score,
-                    "attempts": self.attempts,
-                    "elapsed_seconds": elapsed,
-                    "target_found": self.target_found,
-                    "vars": self.variables,
-                }
-                if not eval_cond(when, ctx):
+            for action in plan:
+                if not eval_cond(action.when, self._cond_ctx(elapsed, max_attempts)):
                     continue
 
-                print(f"Executing action: {action.get('name')} (type={action.get('type')})")
+                print(f"Executing action: {action.name} (type={action.type})")
                 if self.dry_run:
                     continue
 
-                # render params using Jinja2 if available, else fallback to simple replacement
-                def render_param(v):
-                    if not isinstance(v, str):
-                        return v
-                    if HAVE_JINJA and self.jinja_env:
-                        try:
-                            tpl = self.jinja_env.from_string(v)
-                            ctx = {"vars": self.variables, "last_match_score": self.last_match_score, "attempts": self.attempts}
-                            return tpl.render(**ctx)
-                        except Exception:
-                            return v
-                    # fallback simple replacement
-                    if "{{" in v and "}}" in v:
-                        for k, val in self.variables.items():
-                            v = v.replace(f"{{{{ {k} }}}}", str(val))
-                            v = v.replace(f"{{{{{k}}}}}", str(val))
-                    return v
-
-                if isinstance(params, dict):
-                    for pk, pv in list(params.items()):
-                        params[pk] = render_param(pv)
-
-                t = action.get("type")
-                params = action.get("params", {})
-
-                if t == "detect_image":
-                    # Detection supports browser screenshots (default) and desktop/window captures
-                    target = self.cfg.get("target", {})
-                    ttype = target.get("type", "url")
-                    img = None
-                    # prefer persistent driver
-                    try:
-                        if ttype in ("url", "selector"):
-                            url = target.get("value", "https://www.google.com")
-                            driver = self.get_driver(url)
-                            img = self.mod.cv2.imread(str(self.mod.Path(self.cfg.get("screenshot", "build_zone/data/google.png"))))
-                        elif ttype in ("window_title", "process_name"):
-                            # capture window by title
-                            title = target.get("value")
-                            bbox = None
-                            if gw:
-                                for w in gw.getAllWindows():
-                                    if title.lower() in (w.title or "").lower():
-                                        bbox = (w.left, w.top, w.width, w.height)
-                                        break
-
-                            if bbox is None:
-                                # try xdotool fallback on Linux
-                                bbox = get_window_bbox_by_xdotool(title)
-
-                            if bbox:
-                                ss = pyautogui.screenshot(region=bbox)
-                                img = self.mod.cv2.cvtColor(self.mod.np.array(ss), self.mod.cv2.COLOR_RGB2BGR)
-                            else:
-                                print(f"Window with title containing '{title}' not found; falling back to full-screen capture")
-                                ss = pyautogui.screenshot()
-                                img = self.mod.cv2.cvtColor(self.mod.np.array(ss), self.mod.cv2.COLOR_RGB2BGR)
-                        else:
-                            print(f"Unknown target type for detect_image: {ttype}")
-
-                        template_path = Path(params.get("template_path"))
-                        template = self.mod.cv2.imread(str(template_path))
-                        if img is None or template is None:
-                            print("Failed to read screenshot or template for detection")
-                            self.last_match_score = 0.0
-                            self.target_found = False
-                        else:
-                            scales = params.get("scales")
-                            best_val, best_loc, (w, h) = self.mod.multi_scale_template_match(img, template, scales=scales)
-                            print(f"Detected score: {best_val}")
-                            self.last_match_score = float(best_val)
-                            self.target_found = best_val >= params.get("threshold", 0.78)
-                            if params.get("save_detected_annotated") and best_loc and self.target_found:
-                                top_left = best_loc
-                                bottom_right = (top_left[0] + w, top_left[1] + h)
-                                annotated = img.copy()
-                                self.mod.cv2.rectangle(annotated, top_left, bottom_right, (0, 0, 255), 3)
-                                annotated_path = params.get("annotated_path") or self.cfg.get("annotated")
-                                if annotated_path:
-                                    self.mod.cv2.imwrite(str(annotated_path), annotated)
-                    except Exception as e:
-                        print(f"detect_image failed: {e}")
-                    # do not quit driver here; persistent driver will be cleaned up after actions
-
-                elif t == "notify":
-                    title = params.get("title", "Automation")
-                    message = params.get("message", "")
-                    # simple template replacement
-                    message = message.replace("{{ last_match_score }}", str(self.last_match_score))
-                    try:
-                        self.mod.notify_desktop(title, message)
-                    except Exception as e:
-                        print(f"notify failed: {e}")
-
-                elif t == "run_command":
-                    cmd = params.get("command")
-                    if not cmd:
-                        continue
-                    # if command looks like JS alert and a driver exists, run in browser
-                    if cmd.strip().startswith("alert("):
-                        url = self.cfg.get("target", {}).get("value", "https://www.google.com")
-                        d = self.get_driver(url)
-                        try:
-                            try:
-                                d.execute_script(cmd)
-                                time.sleep(0.5)
-                            except Exception as e:
-                                print(f"failed to exec script: {e}")
-                        except Exception:
-                            pass
-                    else:
-                        try:
-                            subprocess.run(cmd, shell=True)
-                        except Exception as e:
-                            print(f"run_command failed: {e}")
-
-                elif t == "click_selector":
-                    selector = params.get("selector")
-                    if not selector:
-                        print("click_selector missing selector param")
-                        continue
-                    url = self.cfg.get("target", {}).get("value", "https://www.google.com")
-                    d = self.get_driver(url)
-                    try:
-                        try:
-                            el = d.find_element(self.mod.By.CSS_SELECTOR, selector)
-                            el.click()
-                        except Exception as e:
-                            print(f"click_selector failed: {e}")
-                    except Exception:
-                        pass
-
-                elif t == "keystroke":
-                    # simple keystroke emmulation using Selenium send_keys to active element or selector
-                    keys = params.get("keys")
-                    selector = params.get("selector")
-                    url = self.cfg.get("target", {}).get("value", "https://www.google.com")
-                    d = self.get_driver(url)
-                    try:
-                        try:
-                            if selector:
-                                el = d.find_element(self.mod.By.CSS_SELECTOR, selector)
-                                el.send_keys(keys)
-                            else:
-                                d.switch_to.active_element.send_keys(keys)
-                        except Exception as e:
-                            print(f"keystroke failed: {e}")
-                    except Exception:
-                        pass
-
-                elif t == "click_image":
-                    # detect the image first
-                    url = self.cfg.get("target", {}).get("value", "https://www.google.com")
-                    # prefer persistent driver
-                    local_driver = self.get_driver(url) if ttype in ("url", "selector") else None
-                    try:
-                        # when using a browser driver, rely on saved screenshot path
-                        if local_driver is not None:
-                            img = self.mod.cv2.imread(str(self.mod.Path(self.cfg.get("screenshot", "build_zone/data/google.png"))))
-                        else:
-                            # desktop capture (full screen or window bbox handled earlier in detect)
-                            img = None
-                        template_path = Path(params.get("template_path"))
-                        template = self.mod.cv2.imread(str(template_path))
-                        if img is None or template is None:
-                            print("Failed to read screenshot or template for click_image")
-                            continue
-
-                        scales = params.get("scales")
-                        best_val, best_loc, (w, h) = self.mod.multi_scale_template_match(img, template, scales=scales)
-                        print(f"click_image detected score: {best_val}")
-                        if best_loc is None:
-                            continue
-
-                        # compute click target; default is center
-                        cx = best_loc[0] + w / 2
-                        cy = best_loc[1] + h / 2
-
-                        # optional expansion box
-                        click_w = params.get("click_width")
-                        click_h = params.get("click_height")
-                        if click_w and click_h:
-                            # center of expanded box
-                            cx = best_loc[0] + w / 2
-                            cy = best_loc[1] + h / 2
-                            # compute expanded box coords (no randomness for now)
-                            x0 = cx - float(click_w) / 2
-                            y0 = cy - float(click_h) / 2
-                            x1 = cx + float(click_w) / 2
-                            y1 = cy + float(click_h) / 2
-                            # clamp
-                            cx = max(0, min(img.shape[1] - 1, (x0 + x1) / 2))
-                            cy = max(0, min(img.shape[0] - 1, (y0 + y1) / 2))
-
-                            # optional randomization inside expanded box
-                            if params.get("randomize", False):
-                                rx = random.uniform(x0, x1)
-                                ry = random.uniform(y0, y1)
-                                cx = max(0, min(img.shape[1] - 1, rx))
-                                cy = max(0, min(img.shape[0] - 1, ry))
-
-                        native_click = params.get("native_click", False)
-
-                        if native_click and ttype in ("window_title", "process_name"):
-                            # perform native click on screen coords
-                            # we already support window bbox capture during detect_image; try to locate same window
-                            title = target.get("value")
-                            bbox = None
-                            if gw:
-                                for w in gw.getAllWindows():
-                                    if title.lower() in (w.title or "").lower():
-                                        bbox = (w.left, w.top, w.width, w.height)
-                                        break
-                            if bbox is None:
-                                bbox = get_window_bbox_by_xdotool(title)
-                            if bbox is None:
-                                # fallback to full screen origin
-                                left, top = 0, 0
-                            else:
-                                left, top = bbox[0], bbox[1]
-
-                            screen_x = int(left + cx)
-                            screen_y = int(top + cy)
-                            try:
-                                pyautogui.click(screen_x, screen_y)
-                            except Exception as e:
-                                print(f"native pyautogui.click failed: {e}")
-
-                        else:
-                            # use browser click via elementFromPoint; prefer persistent driver
-                            use_driver = local_driver or self.driver
-                            if use_driver is None:
-                                print("No browser driver available to perform click_image")
-                            else:
-                                try:
-                                    dpr = float(use_driver.execute_script('return window.devicePixelRatio || 1'))
-                                except Exception:
-                                    dpr = 1.0
-                                client_x = int(cx / dpr)
-                                client_y = int(cy / dpr)
-                                try:
-                                    use_driver.execute_script('window.scrollTo(0, arguments[0] - 100);', client_y)
-                                except Exception:
-                                    pass
-                                try:
-                                    use_driver.execute_script(
-                                        "var el = document.elementFromPoint(arguments[0], arguments[1]); if(el){ el.click(); return true;} return false;",
-                                        client_x,
-                                        client_y,
-                                    )
-                                except Exception as e:
-                                    print(f"click_image JS click failed: {e}")
-                    finally:
-                        # do not quit persistent driver here; if a temporary driver was created separately handle it in get_driver
-                        pass
-
-                elif t == "reload_vars":
-                    # reload variables from variables.yaml
-                    vars_path = Path(__file__).resolve().parent / "variables.yaml"
-                    if vars_path.exists():
-                        try:
-                            self.variables = yaml.safe_load(vars_path.read_text()) or {}
-                            print("variables reloaded")
-                        except Exception as e:
-                            print(f"reload_vars failed: {e}")
-                    else:
-                        print("variables.yaml not found")
-
-                else:
-                    print(f"unknown action type: {t}")
+                await self._in_executor(self._execute_action, action)
 
             # check exit and loop; persistent driver remains open across loops
 
             # Check exit on success
-            exit_cfg = self.cfg.get("exit", {})
-            on_success = exit_cfg.get("on_success")
             if on_success:
-                if eval_cond(on_success.get("condition", "false"), {"last_match_score": self.last_match_score, "attempts": self.attempts}):
+                if eval_cond(on_success.get("condition", "false"), self._cond_ctx(elapsed, max_attempts)):
                     act = on_success.get("action")
                     if act and act.get("type") == "notify":
                         params = act.get("params", {})
-                        self.mod.notify_desktop(params.get("title", "Finished"), params.get("message", ""))
+                        await self._in_executor(self.mod.notify_desktop, params.get("title", "Finished"), params.get("message", ""))
                     print("Exit condition (success) met; stopping")
                     return
 
             # timeout condition
             if max_attempts and self.attempts >= max_attempts:
-                on_timeout = exit_cfg.get("on_timeout")
-                if on_timeout and eval_cond(on_timeout.get("condition", "false"), {"attempts": self.attempts}):
+                if on_timeout and eval_cond(on_timeout.get("condition", "false"), self._cond_ctx(elapsed, max_attempts)):
                     act = on_timeout.get("action")
                     if act and act.get("type") == "notify":
                         params = act.get("params", {})
-                        self.mod.notify_desktop(params.get("title", "Timeout"), params.get("message", ""))
+                        await self._in_executor(self.mod.notify_desktop, params.get("title", "Timeout"), params.get("message", ""))
                     print("Exit condition (timeout) met; stopping")
                     return
 
-            time.sleep(interval)
+            await self._sleep(interval)
 
-        # cleanup persistent driver if present
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
+    def _execute_action(self, action: "PlannedAction"):
+        """Run a single action synchronously (called on the runner's executor)."""
+        handler = self._handlers.get(action.type)
+        if handler is None:
+            print(f"unknown action type: {action.type}")
+            return
+        # render into a fresh dict so the next iteration starts from the template strings
+        params = {k: self.render_param(v) for k, v in action.params.items()}
+        handler(params)
 
-    def get_driver(self, url: str = None):
-        """Return a persistent Selenium driver for web targets, creating it if necessary."""
-        if self.driver:
-            return self.driver
+    def _do_detect_image(self, params: dict):
+        """Match the template against the current target capture and record the score."""
+        ttype = self.ttype
+        # Detection supports browser screenshots (default) and desktop/window captures
+        img = None
+        # prefer persistent driver
         try:
-            target = self.cfg.get("target", {})
-            ttype = target.get("type", "url")
             if ttype in ("url", "selector"):
-                url = url or target.get("value", "https://www.google.com")
-                self.driver = self.mod.open_google_and_screenshot(url=url, headless=self.headless)
-                return self.driver
+                driver = self.get_driver(self.tvalue)
+                img = self._load_image(self.screenshot_path)
+            elif ttype in ("window_title", "process_name"):
+                # capture window by title
+                title = self.tvalue
+                bbox = self._resolve_bbox(title)
+                if not bbox:
+                    print(f"Window with title containing '{title}' not found; falling back to full-screen capture")
+                img = self._grab(bbox)
+            else:
+                print(f"Unknown target type for detect_image: {ttype}")
+
+            template_path = Path(params.get("template_path"))
+            match = self._match_template(img, template_path, params.get("scales")) if img is not None else None
+            if match is None:
+                print("Failed to read screenshot or template for detection")
+                self.last_match_score = 0.0
+                self.target_found = False
+            else:
+                best_val, best_loc, (w, h) = match
+                print(f"Detected score: {best_val}")
+                self.last_match_score = float(best_val)
+                self.target_found = best_val >= params.get("threshold", 0.78)
+                if params.get("save_detected_annotated") and best_loc and self.target_found:
+                    top_left = best_loc
+                    bottom_right = (top_left[0] + w, top_left[1] + h)
+                    annotated = img.copy()
+                    self.mod.cv2.rectangle(annotated, top_left, bottom_right, (0, 0, 255), 3)
+                    annotated_path = params.get("annotated_path") or self.annotated_path
+                    if annotated_path:
+                        note_own_write(annotated_path)
+                        self.mod.cv2.imwrite(str(annotated_path), annotated)
+        except Exception as e:
+            print(f"detect_image failed: {e}")
+        # do not quit driver here; persistent driver will be cleaned up after actions
+
+    def _do_notify(self, params: dict):
+        """Show a desktop notification."""
+        title = params.get("title", "Automation")
+        message = params.get("message", "")
+        # simple template replacement
+        message = message.replace("{{ last_match_score }}", str(self.last_match_score))
+        try:
+            self.mod.notify_desktop(title, message)
+        except Exception as e:
+            print(f"notify failed: {e}")
+
+    def _do_run_command(self, params: dict):
+        """Run a command, or a JS alert(...) in the browser target.
+
+        Commands are split with shlex and executed without a shell; set
+        ``shell: true`` in params for pipelines or other shell syntax.
+        """
+        cmd = params.get("command")
+        if not cmd:
+            return
+        # if command looks like JS alert and a driver exists, run in browser
+        if cmd.strip().startswith("alert("):
+            d = self.get_driver(self.tvalue)
+            try:
+                d.execute_script(cmd)
+                time.sleep(0.5)
+            except Exception as e:
+                print(f"failed to exec script: {e}")
+            return
+        try:
+            if params.get("shell", False):
+                subprocess.run(cmd, shell=True)
+            else:
+                subprocess.run(self._command_argv(cmd), check=False)
+        except Exception as e:
+            print(f"run_command failed: {e}")
+
+    def _command_argv(self, cmd: str):
+        """argv for cmd. Static commands were split once by validate(); rendered
+        (templated) ones change every cycle, so they are split each time and not cached."""
+        argv = self._argv_cache.get(cmd)
+        if argv is None:
+            argv = shlex.split(cmd)
+        return argv
+
+    def _find(self, d, selector: str, refresh: bool = False):
+        """Return the element for a CSS selector, reusing the previous lookup on this driver."""
+        key = (id(d), selector)
+        el = None if refresh else self._el_cache.get(key)
+        if el is None:
+            el = d.find_element(self.mod.By.CSS_SELECTOR, selector)
+            self._el_cache[key] = el
+        return el
+
+    def _with_element(self, d, selector: str, fn):
+        """Call fn with the cached element for selector, looking it up again once if it went stale."""
+        from selenium.common.exceptions import StaleElementReferenceException
+        try:
+            return fn(self._find(d, selector))
+        except StaleElementReferenceException:
+            return fn(self._find(d, selector, refresh=True))
+
+    def _do_click_selector(self, params: dict):
+        """Click the first element matching a CSS selector in the browser target."""
+        selector = params.get("selector")
+        if not selector:
+            print("click_selector missing selector param")
+            return
+        d = self.get_driver(self.tvalue)
+        try:
+            self._with_element(d, selector, lambda el: el.click())
+        except Exception as e:
+            print(f"click_selector failed: {e}")
+
+    def _do_keystroke(self, params: dict):
+        """Send keys to a selector (or the active element) in the browser target."""
+        # simple keystroke emmulation using Selenium send_keys to active element or selector
+        keys = params.get("keys")
+        selector = params.get("selector")
+        d = self.get_driver(self.tvalue)
+        try:
+            if selector:
+                self._with_element(d, selector, lambda el: el.send_keys(keys))
+            else:
+                d.switch_to.active_element.send_keys(keys)
+        except Exception as e:
+            print(f"keystroke failed: {e}")
+
+    def _do_click_image(self, params: dict):
+        """Locate the template and click it, natively or through the browser."""
+        ttype = self.ttype
+        # detect the image first
+        url = self.tvalue
+        # prefer persistent driver
+        local_driver = self.get_driver(url) if ttype in ("url", "selector") else None
+        try:
+            # when using a browser driver, rely on saved screenshot path
+            if local_driver is not None:
+                img = self._load_image(self.screenshot_path)
+            elif ttype in ("window_title", "process_name"):
+                # desktop capture; reuses the frame detect_image grabbed this iteration
+                img = self._grab(self._resolve_bbox(self.tvalue))
+            else:
+                img = None
+            template_path = Path(params.get("template_path"))
+            match = self._match_template(img, template_path, params.get("scales")) if img is not None else None
+            if match is None:
+                print("Failed to read screenshot or template for click_image")
+                return
+
+            best_val, best_loc, (w, h) = match
+            print(f"click_image detected score: {best_val}")
+            if best_loc is None:
+                return
+
+            # compute click target; default is center
+            cx = best_loc[0] + w / 2
+            cy = best_loc[1] + h / 2
+
+            # optional expansion box
+            click_w = params.get("click_width")
+            click_h = params.get("click_height")
+            if click_w and click_h:
+                # center of expanded box
+                cx = best_loc[0] + w / 2
+                cy = best_loc[1] + h / 2
+                # compute expanded box coords (no randomness for now)
+                x0 = cx - float(click_w) / 2
+                y0 = cy - float(click_h) / 2
+                x1 = cx + float(click_w) / 2
+                y1 = cy + float(click_h) / 2
+                # clamp
+                cx = max(0, min(img.shape[1] - 1, (x0 + x1) / 2))
+                cy = max(0, min(img.shape[0] - 1, (y0 + y1) / 2))
+
+                # optional randomization inside expanded box
+                if params.get("randomize", False):
+                    rx = random.uniform(x0, x1)
+                    ry = random.uniform(y0, y1)
+                    cx = max(0, min(img.shape[1] - 1, rx))
+                    cy = max(0, min(img.shape[0] - 1, ry))
+
+            native_click = params.get("native_click", False)
+
+            if native_click and ttype in ("window_title", "process_name"):
+                # perform native click on screen coords
+                # we already support window bbox capture during detect_image; try to locate same window
+                title = self.tvalue
+                bbox = self._resolve_bbox(title)
+                if bbox is None:
+                    # fallback to full screen origin
+                    left, top = 0, 0
+                else:
+                    left, top = bbox[0], bbox[1]
+
+                screen_x = int(left + cx)
+                screen_y = int(top + cy)
+                try:
+                    _pyautogui().click(screen_x, screen_y)
+                except Exception as e:
+                    print(f"native pyautogui.click failed: {e}")
+
+            else:
+                # use browser click via elementFromPoint; prefer persistent driver
+                use_driver = local_driver or self.driver
+                if use_driver is None:
+                    print("No browser driver available to perform click_image")
+                else:
+                    try:
+                        dpr = float(use_driver.execute_script('return window.devicePixelRatio || 1'))
+                    except Exception:
+                        dpr = 1.0
+                    client_x = int(cx / dpr)
+                    client_y = int(cy / dpr)
+                    try:
+                        use_driver.execute_script('window.scrollTo(0, arguments[0] - 100);', client_y)
+                    except Exception:
+                        pass
+                    try:
+                        use_driver.execute_script(
+                            "var el = document.elementFromPoint(arguments[0], arguments[1]); if(el){ el.click(); return true;} return false;",
+                            client_x,
+                            client_y,
+                        )
+                    except Exception as e:
+                        print(f"click_image JS click failed: {e}")
+        finally:
+            # do not quit persistent driver here; if a temporary driver was created separately handle it in get_driver
+            pass
+
+    def _do_reload_vars(self, params: dict):
+        """Reload variables from variables.yaml."""
+        # reload variables from variables.yaml
+        if VARS_PATH.exists():
+            try:
+                variables = load_yaml_cached(VARS_PATH) or {}
+                if variables is self.variables:
+                    print("variables unchanged")
+                else:
+                    self.variables = variables
+                    print("variables reloaded")
+            except Exception as e:
+                print(f"reload_vars failed: {e}")
+        else:
+            print("variables.yaml not found")
+
+    def preload_driver(self):
+        """Start Chrome for web targets in the background so the first poll doesn't wait on it."""
+        if self.dry_run or self.ttype not in ("url", "selector") or self.driver or self._driver_future:
+            return
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-preload")
+        self._driver_future = pool.submit(self.mod.open_google_and_screenshot, url=self.tvalue, headless=self.headless)
+        pool.shutdown(wait=False)
+
+    def _claim_preloaded_driver(self):
+        """Adopt the driver started by preload_driver, waiting for it if Chrome is still starting."""
+        future, self._driver_future = self._driver_future, None
+        if future is None:
+            return
+        try:
+            self.driver = future.result()
         except Exception as e:
             print(f"failed to create persistent driver: {e}")
-        return None
+
+    def get_driver(self, url: str = None):
+        """Return a persistent Selenium driver for web targets, creating it if necessary."""
+        with self._driver_lock:
+            if self._driver_future is not None:
+                self._claim_preloaded_driver()
+            if self.driver:
+                return self.driver
+            try:
+                if self.ttype in ("url", "selector"):
+                    url = url or self.tvalue
+                    self.driver = self.mod.open_google_and_screenshot(url=url, headless=self.headless)
+                    return self.driver
+            except Exception as e:
+                print(f"failed to create persistent driver: {e}")
+            return None
+
+
+def collect_config_paths(values: List[str]) -> List[Path]:
+    """Expand --config arguments; directories contribute every *.yaml/*.yml inside."""
+    paths = []
+    for v in values:
+        p = Path(v)
+        if p.is_dir():
+            paths.extend(sorted(q for q in p.iterdir() if q.suffix in (".yaml", ".yml")))
+        else:
+            paths.append(p)
+    return paths
+
+
+async def run_all(runners: List[AutomationRunner]):
+    """Run several automations concurrently on one event loop."""
+    await asyncio.gather(*(r.run() for r in runners))
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--config", required=True)
+    parser.add_argument("--config", required=True, nargs="+", help="automation YAML file(s) or directories of them")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--headless", action="store_true")
     args = parser.parse_args()
 
-    runner = AutomationRunner(Path(args.config), dry_run=args.dry_run, headless=args.headless)
-    try:
-        runner.validate()
-    except Exception as e:
-        print(f"config validation failed: {e}")
-        sys.exit(2)
+    runners = []
+    for cfg_path in collect_config_paths(args.config):
+        runner = AutomationRunner(cfg_path, dry_run=args.dry_run, headless=args.headless)
+        try:
+            runner.validate()
+        except Exception as e:
+            print(f"config validation failed ({cfg_path}): {e}")
+            sys.exit(2)
+        runners.append(runner)
 
     if args.dry_run:
-        runner.dry()
+        for runner in runners:
+            runner.dry()
     else:
-        runner.run()
+        # every config is valid: start browsers while the event loop spins up
+        for runner in runners:
+            runner.preload_driver()
+        asyncio.run(run_all(runners))
 
 
 if __name__ == "__main__":
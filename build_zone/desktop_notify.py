@@ -0,0 +1,34 @@
+"""Desktop notifications over D-Bus, shared by main and interactive_capture."""
+import threading
+
+# session-bus connection kept open between notifications, see dbus_notify
+_NOTIFY_BUS = None
+# jeepney's blocking connection is not thread-safe; runner and capture worker
+# threads all notify through it
+_NOTIFY_LOCK = threading.Lock()
+
+
+def dbus_notify(title: str, message: str):
+    """Send org.freedesktop.Notifications.Notify with jeepney over a cached connection.
+
+    Raises if jeepney or a session bus is unavailable; callers fall back to notify-send.
+    """
+    global _NOTIFY_BUS
+    from jeepney import DBusAddress, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+    addr = DBusAddress("/org/freedesktop/Notifications",
+                       bus_name="org.freedesktop.Notifications",
+                       interface="org.freedesktop.Notifications")
+    # app_name, replaces_id, icon, summary, body, actions, hints, expire_timeout
+    msg = new_method_call(addr, "Notify", "susssasa{sv}i", ("Openscript", 0, "", title, message, [], {}, -1))
+    with _NOTIFY_LOCK:
+        if _NOTIFY_BUS is None:
+            _NOTIFY_BUS = open_dbus_connection(bus="SESSION")
+        try:
+            unwrap_msg(_NOTIFY_BUS.send_and_get_reply(msg, timeout=2))
+        except Exception:
+            # drop a broken connection; the next notification reconnects
+            conn, _NOTIFY_BUS = _NOTIFY_BUS, None
+            conn.close()
+            raise
@@ -2,11 +2,30 @@ import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
 import yaml
 import os
+import re
 import subprocess
 import sys
+from collections import OrderedDict
 from PIL import Image, ImageTk
+try:
+    from Xlib import X, display as xdisplay
+    HAVE_XLIB = True
+except Exception:
+    HAVE_XLIB = False
 
+# run as a script (python build_zone/x.py) or imported as build_zone.x
+try:
+    from .yaml_io import Loader as _Loader, atomic_write_yaml as _atomic_write_yaml
+except ImportError:
+    from yaml_io import Loader as _Loader, atomic_write_yaml as _atomic_write_yaml
+
+# variable names double as YAML keys, template names and file names
+_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,63}')
+# previews kept in ConfigWindow's thumbnail LRU
+THUMB_CACHE_SIZE = 32
 VARS_PATH = os.path.join(os.path.dirname(__file__), "variables.yaml")
+# last parsed variables.yaml keyed by mtime, see ConfigWindow.load_vars
+_VARS_CACHE = {"mtime": None, "data": None}
 
 
 def safe_call(cmd):
@@ -16,6 +35,53 @@ def safe_call(cmd):
         return ''
 
 
+def list_windows_xlib():
+    """List top-level windows from EWMH _NET_CLIENT_LIST as (wid, x, y, w, h, title).
+
+    Same shape as the wmctrl -lG parse in select_window, without spawning wmctrl.
+    """
+    disp = xdisplay.Display()
+    try:
+        root = disp.screen().root
+        clients = root.get_full_property(disp.intern_atom("_NET_CLIENT_LIST"), X.AnyPropertyType)
+        if clients is None:
+            return []
+        net_wm_name = disp.intern_atom("_NET_WM_NAME")
+        utf8 = disp.intern_atom("UTF8_STRING")
+        choices = []
+        for wid in clients.value:
+            win = disp.create_resource_object("window", wid)
+            prop = win.get_full_property(net_wm_name, utf8)
+            if prop is not None:
+                title = prop.value.decode("utf-8", "replace") if isinstance(prop.value, bytes) else str(prop.value)
+            else:
+                title = win.get_wm_name() or ''
+                if isinstance(title, bytes):
+                    title = title.decode("latin-1")
+            geom = win.get_geometry()
+            # root's origin in window coordinates is minus the window's absolute position
+            pos = win.translate_coords(root, 0, 0)
+            choices.append((f"0x{wid:08x}", -pos.x, -pos.y, geom.width, geom.height, title))
+        return choices
+    finally:
+        disp.close()
+
+
+def list_windows_wmctrl():
+    """List windows by parsing `wmctrl -lG` output as (wid, x, y, w, h, title)."""
+    out = safe_call(["wmctrl", "-lG"]).strip()
+    lines = [l for l in out.splitlines() if l.strip()]
+    choices = []
+    for l in lines:
+        parts = l.split(None, 6)
+        # wmctrl -lG: id desktop x y w h host title
+        if len(parts) >= 7:
+            wid, desktop, x, y, w, h, rest = parts[0], parts[1], parts[2], parts[3], parts[4], parts[5], parts[6]
+            title = rest
+            choices.append((wid, int(x), int(y), int(w), int(h), title))
+    return choices
+
+
 class ConfigWindow(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -46,6 +112,8 @@ class ConfigWindow(tk.Tk):
         self.tree.pack(fill=tk.BOTH, expand=True)
         self.tree.bind('<Double-1>', self.edit_selected)
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        # iid -> value text currently displayed, see refresh_tree
+        self._tree_values = {}
 
         btns = tk.Frame(left)
         btns.pack(fill=tk.X)
@@ -63,31 +131,46 @@ class ConfigWindow(tk.Tk):
         tk.Button(bottom, text="Save", command=self.save_vars).pack(side=tk.RIGHT)
         tk.Button(bottom, text="Close", command=self.quit).pack(side=tk.RIGHT, padx=6)
 
-        self.img_cache = None
+        # (path, mtime) -> PhotoImage, most recently shown last; see _thumbnail
+        self._thumbs = OrderedDict()
+        # (path, mtime, PIL image) last decoded for previews, see _decode
+        self._last_decoded = None
         self.refresh_tree()
 
     def load_vars(self):
-        if os.path.exists(VARS_PATH):
+        try:
+            mtime = os.stat(VARS_PATH).st_mtime_ns
+        except OSError:
+            self.vars = {}
+            return
+        if _VARS_CACHE["mtime"] != mtime:
             with open(VARS_PATH, 'r') as f:
                 try:
-                    self.vars = yaml.safe_load(f) or {}
+                    data = yaml.load(f, Loader=_Loader) or {}
                 except Exception:
-                    self.vars = {}
-        else:
-            self.vars = {}
+                    data = {}
+            _VARS_CACHE["mtime"] = mtime
+            _VARS_CACHE["data"] = data
+        # edits stay local until save_vars
+        self.vars = dict(_VARS_CACHE["data"])
 
     def refresh_tree(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for k, v in (self.vars or {}).items():
-            self.tree.insert('', 'end', iid=k, values=(f"{v}"))
+        """Sync the tree with self.vars, touching only rows that were added, removed or changed."""
+        shown = self._tree_values
+        new = {k: f"{v}" for k, v in (self.vars or {}).items()}
+        removed = [k for k in shown if k not in new]
+        if removed:
+            self.tree.delete(*removed)
+        for k, text in new.items():
+            if k not in shown:
+                self.tree.insert('', 'end', iid=k, values=(text,))
+            elif shown[k] != text:
+                self.tree.set(k, 'value', text)
+        self._tree_values = new
 
     def validate_name(self, name):
-        if not name:
-            messagebox.showerror("Invalid name", "Variable name cannot be empty")
-            return False
-        if ' ' in name:
-            messagebox.showerror("Invalid name", "Variable name cannot contain spaces")
+        if not _NAME_RE.fullmatch(name or ''):
+            messagebox.showerror("Invalid name", "Variable name must start with a letter or underscore and use only letters, digits and underscores (max 64)")
             return False
         return True
 
@@ -125,16 +208,45 @@ class ConfigWindow(tk.Tk):
         # show thumbnail if image file
         if isinstance(val, str) and os.path.exists(val) and val.lower().endswith(('.png', '.jpg', '.jpeg')):
             try:
-                img = Image.open(val)
-                img.thumbnail((320, 240))
-                self.img_cache = ImageTk.PhotoImage(img)
-                self.preview_label.config(image=self.img_cache, text='')
+                thumb = self._thumbnail(val)
+                self.preview_label.config(image=thumb, text='')
                 return
             except Exception:
                 pass
         # otherwise clear preview text
         self.preview_label.config(text=str(val), image='')
 
+    def _decode(self, path, mtime):
+        """Return path decoded and scaled to fit the 800x600 preview.
+
+        The last result is kept in self._last_decoded, so preview_selected right
+        after on_select reuses the image instead of reading the file again.
+        """
+        last = self._last_decoded
+        if last is not None and last[0] == path and last[1] == mtime:
+            return last[2]
+        img = Image.open(path)
+        # let libjpeg decode at a reduced scale; no-op for PNG
+        img.draft('RGB', (1600, 1200))
+        img.thumbnail((800, 600))
+        self._last_decoded = (path, mtime, img)
+        return img
+
+    def _thumbnail(self, path):
+        """Return a 320x240 PhotoImage preview of path, decoding it only once per mtime."""
+        key = (path, os.path.getmtime(path))
+        thumb = self._thumbs.get(key)
+        if thumb is not None:
+            self._thumbs.move_to_end(key)
+            return thumb
+        img = self._decode(path, key[1]).copy()
+        img.thumbnail((320, 240))
+        # the dict also keeps the PhotoImage referenced so Tk doesn't drop it
+        thumb = self._thumbs[key] = ImageTk.PhotoImage(img)
+        if len(self._thumbs) > THUMB_CACHE_SIZE:
+            self._thumbs.popitem(last=False)
+        return thumb
+
     def rename_var(self):
         sel = self.tree.selection()
         if not sel:
@@ -166,23 +278,22 @@ class ConfigWindow(tk.Tk):
             self.refresh_tree()
 
     def save_vars(self):
-        with open(VARS_PATH, 'w') as f:
-            yaml.safe_dump(self.vars, f)
+        _atomic_write_yaml(VARS_PATH, self.vars)
+        _VARS_CACHE["mtime"] = os.stat(VARS_PATH).st_mtime_ns
+        _VARS_CACHE["data"] = dict(self.vars)
         messagebox.showinfo("Saved", f"Variables saved to {VARS_PATH}")
 
     def select_window(self):
-        # Try to list windows using wmctrl first, fall back to a simple dialog
+        # List windows through Xlib (or wmctrl), fall back to a simple dialog
         try:
-            out = safe_call(["wmctrl", "-lG"]).strip()
-            lines = [l for l in out.splitlines() if l.strip()]
             choices = []
-            for l in lines:
-                parts = l.split(None, 6)
-                # wmctrl -lG: id desktop x y w h host title
-                if len(parts) >= 7:
-                    wid, desktop, x, y, w, h, rest = parts[0], parts[1], parts[2], parts[3], parts[4], parts[5], parts[6]
-                    title = rest
-                    choices.append((wid, int(x), int(y), int(w), int(h), title))
+            if HAVE_XLIB:
+                try:
+                    choices = list_windows_xlib()
+                except Exception:
+                    choices = []
+            if not choices:
+                choices = list_windows_wmctrl()
             if not choices:
                 raise RuntimeError("No windows found")
             sel = WindowSelectDialog(self, choices).result
@@ -209,8 +320,7 @@ class ConfigWindow(tk.Tk):
         # If var is an image path, open a larger preview
         if isinstance(val, str) and os.path.exists(val) and val.lower().endswith(('.png', '.jpg', '.jpeg')):
             try:
-                img = Image.open(val)
-                img.thumbnail((800, 600))
+                img = self._decode(val, os.path.getmtime(val))
                 top = tk.Toplevel(self)
                 top.title(f"Preview: {key}")
                 photo = ImageTk.PhotoImage(img)
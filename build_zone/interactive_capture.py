@@ -17,25 +17,64 @@ import os
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 
+# run as a script (python build_zone/x.py) or imported as build_zone.x
 try:
-    from pynput import keyboard
-except Exception:
-    keyboard = None
+    from .desktop_notify import dbus_notify
+    from .yaml_io import Loader as _Loader, atomic_write_yaml as _atomic_write_yaml
+except ImportError:
+    from desktop_notify import dbus_notify
+    from yaml_io import Loader as _Loader, atomic_write_yaml as _atomic_write_yaml
 
-import pyautogui
 from PIL import Image
-import numpy as np
 import subprocess
+import functools
 
-# try OpenCV selectROI if available
 try:
-    import cv2
-    HAVE_CV2 = True
+    import mss
+    HAVE_MSS = True
 except Exception:
-    cv2 = None
-    HAVE_CV2 = False
+    HAVE_MSS = False
+
+# numpy and OpenCV are imported on the first capture, see _load_capture_deps;
+# pyautogui, pyvips and pynput only where they're used
+np = None
+cv2 = None
+HAVE_CV2 = False
+
+
+def _load_capture_deps():
+    """Import numpy and (optionally) OpenCV into the module globals on first use."""
+    global np, cv2, HAVE_CV2
+    if np is not None:
+        return
+    # try OpenCV selectROI if available
+    try:
+        import cv2 as _cv2
+    except Exception:
+        _cv2 = None
+    import numpy
+    cv2, HAVE_CV2 = _cv2, _cv2 is not None
+    np = numpy
+
+
+@functools.cache
+def _pyautogui():
+    import pyautogui
+    return pyautogui
+
+
+@functools.cache
+def _pyvips():
+    # libvips encodes PNGs faster than cv2/PIL when installed
+    try:
+        import pyvips
+    except Exception:
+        return None
+    return pyvips
+
 
 # Tkinter fallback for selection
 try:
@@ -49,10 +88,88 @@ ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "data"
 VARS_PATH = ROOT / "variables.yaml"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+# encodes and writes crops off the hotkey thread; one worker keeps saves in order
+_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-io")
+# widest image the Tk selection canvas shows; larger screens are downscaled
+SELECT_MAX_WIDTH = 1280
+# zlib level for saved crops: ~3x faster than the default 6 for ~10% larger files
+PNG_COMPRESSION = 3
+# last parsed variables.yaml, see load_variables
+_VARS_CACHE = {"mtime": None, "data": None}
+
+
+# hidden Tk root shared by the status window and dialogs, see _get_tk_root
+_TK_ROOT = None
+_TK_THREAD = None
+_TK_LOCK = threading.Lock()
+# set once Tk failed to start (e.g. no DISPLAY) so later calls fail fast
+_TK_FAILED = False
+
+
+def _get_tk_root():
+    """Return the shared hidden Tk root, creating it on first use (None if Tk can't start).
+
+    The root is created on, and its mainloop runs on, a single daemon thread, so
+    per-capture windows are cheap Toplevels instead of new Tk interpreters.
+    """
+    global _TK_THREAD
+    with _TK_LOCK:
+        if _TK_ROOT is None and HAVE_TK and not _TK_FAILED:
+            ready = threading.Event()
+
+            def run():
+                global _TK_ROOT, _TK_FAILED
+                try:
+                    root = tk.Tk()
+                    root.withdraw()
+                except Exception:
+                    _TK_FAILED = True
+                    ready.set()
+                    return
+                _TK_ROOT = root
+                ready.set()
+                root.mainloop()
+
+            _TK_THREAD = threading.Thread(target=run, daemon=True)
+            _TK_THREAD.start()
+            ready.wait()
+        return _TK_ROOT
+
+
+def _on_tk(fn):
+    """Run fn(root) on the Tk thread and return its result."""
+    root = _get_tk_root()
+    if root is None:
+        raise RuntimeError("Tk is not available")
+    if threading.current_thread() is _TK_THREAD:
+        return fn(root)
+    done = threading.Event()
+    out = {}
+
+    def call():
+        try:
+            out["value"] = fn(root)
+        except Exception as e:
+            out["error"] = e
+        finally:
+            done.set()
+
+    root.after(0, call)
+    done.wait()
+    if "error" in out:
+        raise out["error"]
+    return out["value"]
 
 
 def gui_notify(title: str, message: str):
     """Try to show a desktop notification or Tk messagebox as a fallback."""
+    # D-Bus directly, without spawning notify-send
+    try:
+        dbus_notify(title, message)
+        return
+    except Exception:
+        pass
+
     # try notify-send
     try:
         subprocess.run(["notify-send", title, message], check=False)
@@ -64,10 +181,7 @@ def gui_notify(title: str, message: str):
     if HAVE_TK:
         try:
             import tkinter.messagebox as messagebox
-            root = tk.Tk()
-            root.withdraw()
-            messagebox.showinfo(title, message)
-            root.destroy()
+            _on_tk(lambda root: messagebox.showinfo(title, message, parent=root))
             return
         except Exception:
             pass
@@ -86,11 +200,7 @@ def gui_input(prompt: str, title: str = "Openscript") -> str | None:
     if HAVE_TK:
         try:
             import tkinter.simpledialog as simpledialog
-            root = tk.Tk()
-            root.withdraw()
-            res = simpledialog.askstring(title, prompt)
-            root.destroy()
-            return res
+            return _on_tk(lambda root: simpledialog.askstring(title, prompt, parent=root))
         except Exception:
             pass
 
@@ -112,24 +222,26 @@ class StatusWindow:
         if not HAVE_TK:
             return
         try:
-            self._root = tk.Tk()
-            self._root.title(title)
-            # small window
-            try:
-                self._root.geometry("320x80")
-            except Exception:
-                pass
-            self._root.attributes("-topmost", True)
-            self._label = tk.Label(self._root, text="", anchor="w", justify="left", padx=8, pady=8)
-            self._label.pack(fill="both", expand=True)
-            # prevent user from closing accidentally
-            try:
-                self._root.protocol("WM_DELETE_WINDOW", lambda: None)
-            except Exception:
-                pass
-            # run mainloop in background thread
-            self._thread = threading.Thread(target=self._root.mainloop, daemon=True)
-            self._thread.start()
+            def build(root):
+                win = tk.Toplevel(root)
+                win.title(title)
+                # small window
+                try:
+                    win.geometry("320x80")
+                except Exception:
+                    pass
+                win.attributes("-topmost", True)
+                label = tk.Label(win, text="", anchor="w", justify="left", padx=8, pady=8)
+                label.pack(fill="both", expand=True)
+                # prevent user from closing accidentally
+                try:
+                    win.protocol("WM_DELETE_WINDOW", lambda: None)
+                except Exception:
+                    pass
+                return win, label
+
+            # a Toplevel on the shared root; its mainloop is already running
+            self._root, self._label = _on_tk(build)
             self._active = True
         except Exception:
             self._active = False
@@ -152,15 +264,36 @@ class StatusWindow:
         self._active = False
 
 
-def save_variable(name: str, path: str):
-    vars_map = {}
-    if VARS_PATH.exists():
+def load_variables() -> dict:
+    """Return the name -> path mapping from variables.yaml.
+
+    The parsed file is kept in _VARS_CACHE and only re-read when its mtime changes.
+    """
+    try:
+        mtime = VARS_PATH.stat().st_mtime_ns
+    except OSError:
+        return {}
+    if _VARS_CACHE["mtime"] != mtime:
         try:
-            vars_map = yaml.safe_load(VARS_PATH.read_text()) or {}
+            data = yaml.load(VARS_PATH.read_text(), Loader=_Loader) or {}
         except Exception:
-            vars_map = {}
+            data = {}
+        _VARS_CACHE["mtime"] = mtime
+        _VARS_CACHE["data"] = data
+    return _VARS_CACHE["data"]
+
+
+def save_variable(name: str, path: str):
+    current = load_variables()
+    if current.get(name) == str(path):
+        # re-capture to the same file: variables.yaml already says this
+        return
+    vars_map = dict(current)
     vars_map[name] = str(path)
-    VARS_PATH.write_text(yaml.safe_dump(vars_map))
+    _atomic_write_yaml(VARS_PATH, vars_map)
+    # what we just wrote is the current content; no need to parse it back
+    _VARS_CACHE["mtime"] = VARS_PATH.stat().st_mtime_ns
+    _VARS_CACHE["data"] = vars_map
 
 
 def tk_select_bbox(pil_img: Image.Image):
@@ -168,55 +301,81 @@ def tk_select_bbox(pil_img: Image.Image):
     if not HAVE_TK:
         return None
 
-    root = tk.Tk()
-    root.title("Select area and press Enter")
-
-    w, h = pil_img.size
-    canvas = tk.Canvas(root, width=w, height=h)
-    canvas.pack()
-    tk_img = ImageTk.PhotoImage(pil_img)
-    canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
+    # the canvas repaints on every drag event; keep it small and scale the bbox back up
+    orig_w = pil_img.size[0]
+    if orig_w > SELECT_MAX_WIDTH:
+        pil_img = pil_img.copy()
+        pil_img.thumbnail((SELECT_MAX_WIDTH, SELECT_MAX_WIDTH), Image.BILINEAR)
+    scale = orig_w / pil_img.size[0]
 
-    rect = None
-    start_x = start_y = 0
     bbox = [0, 0, 0, 0]
+    done = threading.Event()
+
+    def build(root):
+        # a Toplevel on the shared root rather than a second Tk interpreter
+        win = tk.Toplevel(root)
+        win.title("Select area and press Enter")
+        w, h = pil_img.size
+        canvas = tk.Canvas(win, width=w, height=h)
+        canvas.pack()
+        tk_img = ImageTk.PhotoImage(pil_img, master=win)
+        canvas.create_image(0, 0, anchor=tk.NW, image=tk_img)
+        # Tk drops images that Python no longer references
+        canvas.image = tk_img
+
+        rect = None
+        start_x = start_y = 0
+
+        def on_button_press(event):
+            nonlocal start_x, start_y, rect
+            start_x = event.x
+            start_y = event.y
+            rect = canvas.create_rectangle(start_x, start_y, start_x, start_y, outline='red', width=2)
+
+        def on_move(event):
+            if rect:
+                canvas.coords(rect, start_x, start_y, event.x, event.y)
+
+        def on_button_release(event):
+            x0 = min(start_x, event.x)
+            y0 = min(start_y, event.y)
+            x1 = max(start_x, event.x)
+            y1 = max(start_y, event.y)
+            bbox[:] = [int(x0), int(y0), int(x1 - x0), int(y1 - y0)]
+
+        def close():
+            win.destroy()
+            done.set()
+
+        def on_key(event):
+            # Enter closes
+            if event.keysym == 'Return':
+                close()
+
+        canvas.bind("<ButtonPress-1>", on_button_press)
+        canvas.bind("<B1-Motion>", on_move)
+        canvas.bind("<ButtonRelease-1>", on_button_release)
+        win.bind('<Key>', on_key)
+        win.protocol("WM_DELETE_WINDOW", close)
+        win.focus_force()
+        return win
+
+    try:
+        win = _on_tk(build)
+    except Exception:
+        return None
+    if threading.current_thread() is _TK_THREAD:
+        win.wait_window()
+    else:
+        done.wait()
+    if not (bbox[2] > 0 and bbox[3] > 0):
+        return None
+    return tuple(int(round(v * scale)) for v in bbox)
 
-    def on_button_press(event):
-        nonlocal start_x, start_y, rect
-        start_x = event.x
-        start_y = event.y
-        rect = canvas.create_rectangle(start_x, start_y, start_x, start_y, outline='red', width=2)
-
-    def on_move(event):
-        nonlocal rect
-        if rect:
-            canvas.coords(rect, start_x, start_y, event.x, event.y)
-
-    def on_button_release(event):
-        nonlocal bbox
-        x0 = min(start_x, event.x)
-        y0 = min(start_y, event.y)
-        x1 = max(start_x, event.x)
-        y1 = max(start_y, event.y)
-        bbox = [int(x0), int(y0), int(x1 - x0), int(y1 - y0)]
-
-    def on_key(event):
-        # Enter closes
-        if event.keysym == 'Return':
-            root.quit()
-
-    canvas.bind("<ButtonPress-1>", on_button_press)
-    canvas.bind("<B1-Motion>", on_move)
-    canvas.bind("<ButtonRelease-1>", on_button_release)
-    root.bind('<Key>', on_key)
-
-    root.mainloop()
-    root.destroy()
-    return tuple(bbox) if bbox and bbox[2] > 0 and bbox[3] > 0 else None
-
-
-def select_area(image: np.ndarray):
+
+def select_area(image: "np.ndarray"):
     """Return bbox (x,y,w,h) for selected area. Try cv2.selectROI then Tk fallback."""
+    _load_capture_deps()
     if HAVE_CV2 and hasattr(cv2, 'selectROI'):
         try:
             b = cv2.selectROI("Select area", image, showCrosshair=True, fromCenter=False)
@@ -229,37 +388,88 @@ def select_area(image: np.ndarray):
 
     # Tk fallback
     if HAVE_TK:
-        pil = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if HAVE_CV2 else Image.fromarray(image))
+        # BGR -> RGB as a reversed-channel view; PIL reads it once when building the image
+        pil = Image.fromarray(image[..., ::-1] if HAVE_CV2 else image)
         return tk_select_bbox(pil)
 
     return None
 
 
+# one mss grabber per thread (its X connection is not shareable), see _grabber
+_SCT = threading.local()
+
+
+def _grabber():
+    """Return this thread's mss instance, opening it on first use.
+
+    Keeping it open skips reconnecting to the display and re-creating the
+    capture buffers on every hotkey press.
+    """
+    sct = getattr(_SCT, "sct", None)
+    if sct is None:
+        sct = _SCT.sct = mss.mss()
+    return sct
+
+
+def grab_screen() -> "np.ndarray":
+    """Capture the whole screen as BGR (RGB when OpenCV is missing, for PIL)."""
+    _load_capture_deps()
+    if HAVE_MSS:
+        sct = _grabber()
+        shot = sct.grab(sct.monitors[0])
+        if HAVE_CV2:
+            # mss hands back BGRA; dropping alpha is a view, no copy or cvtColor
+            return np.asarray(shot)[:, :, :3]
+        return np.frombuffer(shot.rgb, dtype=np.uint8).reshape(shot.height, shot.width, 3)
+    arr = np.array(_pyautogui().screenshot())
+    return cv2.cvtColor(arr, cv2.COLOR_RGB2BGR) if HAVE_CV2 else arr
+
+
 def capture_crop_and_save(bbox, out_path: Path, img=None):
-    """Crop screenshot by bbox and save to out_path."""
-    if img is None:
-        ss = pyautogui.screenshot()
-        arr = np.array(ss)
-        img = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR) if HAVE_CV2 else arr
+    """Crop screenshot by bbox and save to out_path.
 
+    Without img only the bbox region is captured, never the whole screen.
+    """
+    _load_capture_deps()
     x, y, w, h = bbox
-    if HAVE_CV2:
+    if img is None:
+        if HAVE_MSS:
+            sct = _grabber()
+            # bbox is relative to the full capture, which starts at the virtual screen origin
+            origin = sct.monitors[0]
+            shot = sct.grab({"left": origin["left"] + x, "top": origin["top"] + y, "width": w, "height": h})
+            Image.frombytes("RGB", shot.size, shot.rgb).save(str(out_path), compress_level=PNG_COMPRESSION)
+        else:
+            _pyautogui().screenshot(region=(x, y, w, h)).save(str(out_path), compress_level=PNG_COMPRESSION)
+        return
+
+    pyvips = _pyvips()
+    if pyvips is not None:
         crop = img[y:y + h, x:x + w]
-        cv2.imwrite(str(out_path), crop)
+        # frames are BGR when OpenCV is present; vips wants RGB
+        rgb = np.ascontiguousarray(crop[..., ::-1] if HAVE_CV2 else crop)
+        vi = pyvips.Image.new_from_memory(rgb.data, rgb.shape[1], rgb.shape[0], 3, 'uchar')
+        vi.pngsave(str(out_path), compression=PNG_COMPRESSION)
+    elif HAVE_CV2:
+        crop = img[y:y + h, x:x + w]
+        ok, buf = cv2.imencode('.png', crop, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION])
+        if not ok:
+            raise RuntimeError(f"could not encode {out_path}")
+        # one open/write/close on the encoded buffer instead of imwrite's stdio path
+        fd = os.open(str(out_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, buf)
+        finally:
+            os.close(fd)
     else:
         pil = Image.fromarray(img)
         crop = pil.crop((x, y, x + w, y + h))
-        crop.save(str(out_path))
+        crop.save(str(out_path), compress_level=PNG_COMPRESSION)
 
 
 def on_hotkey_triggered(name=None):
     # take full screen screenshot
-    ss = pyautogui.screenshot()
-    arr = np.array(ss)
-    if HAVE_CV2:
-        img = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-    else:
-        img = arr
+    img = grab_screen()
 
     # show a status window if no tty
     status = None
@@ -292,48 +502,54 @@ def on_hotkey_triggered(name=None):
         return
 
     out_path = DATA_DIR / f"{name}.png"
-    capture_crop_and_save(bbox, out_path, img=img)
-    save_variable(name, out_path)
-    # notify user via GUI when no console is available
-    if status:
-        status.update(f"Saved selection '{name}' -> {out_path}")
-        # keep it visible for a moment
-        time.sleep(0.5)
-        status.close()
-    try:
-        gui_notify("Openscript", f"Saved selection '{name}' -> {out_path}")
-    except Exception:
-        pass
-    print(f"Saved selection '{name}' -> {out_path}")
 
+    def on_saved(fut):
+        # runs on the io worker once the PNG is on disk
+        try:
+            fut.result()
+        except Exception as e:
+            if status:
+                status.update(f"Saving '{name}' failed: {e}")
+                status.close()
+            print(f"Saving selection '{name}' failed: {e}")
+            return
+        save_variable(name, out_path)
+        # notify user via GUI when no console is available
+        if status:
+            status.update(f"Saved selection '{name}' -> {out_path}")
+            # keep it visible for a moment
+            time.sleep(0.5)
+            status.close()
+        try:
+            gui_notify("Openscript", f"Saved selection '{name}' -> {out_path}")
+        except Exception:
+            pass
+        print(f"Saved selection '{name}' -> {out_path}")
 
-def listen_for_hotkey(combo=(keyboard.Key.ctrl, keyboard.Key.cmd, keyboard.KeyCode.from_char('s')) if keyboard else None):
-    """Listen for the specified combo. If pynput not installed, ask user to press Enter."""
+    # return right away so the hotkey listener is armed again while the crop is written
+    _io_executor.submit(capture_crop_and_save, bbox, out_path, img).add_done_callback(on_saved)
+
+
+def listen_for_hotkey(hotkey='<ctrl>+<cmd>+s'):
+    """Listen for the specified hotkey (pynput syntax). If pynput not installed, ask user to press Enter."""
+    try:
+        from pynput import keyboard
+    except Exception:
+        keyboard = None
     if keyboard is None:
         input("Press Enter to start selection...")
         on_hotkey_triggered()
         return
 
-    pressed = set()
-
-    def on_press(key):
-        try:
-            pressed.add(key)
-            # check combo
-            if all(k in pressed for k in combo):
-                print("Hotkey pressed; starting selection...")
-                on_hotkey_triggered()
-        except Exception:
-            pass
-
-    def on_release(key):
+    def on_activate():
         try:
-            if key in pressed:
-                pressed.remove(key)
+            print("Hotkey pressed; starting selection...")
+            on_hotkey_triggered()
         except Exception:
             pass
 
-    with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
+    # GlobalHotKeys tracks the modifier state itself; no per-keystroke set checks here
+    with keyboard.GlobalHotKeys({hotkey: on_activate}) as listener:
         print("Listening for hotkey (Ctrl+Meta+S) — press it to capture selection. Ctrl+C to quit.")
         listener.join()
 
@@ -0,0 +1,31 @@
+"""YAML helpers shared by interactive_capture and gui_configure."""
+import os
+
+import yaml
+
+__all__ = ["Loader", "Dumper", "atomic_write_yaml"]
+
+# libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader as Loader, SafeDumper as Dumper
+
+
+def atomic_write_yaml(path, data):
+    """Dump data to a sibling temp file and rename it over path.
+
+    os.replace is atomic on POSIX, so a crash mid-dump never leaves a truncated file.
+    """
+    tmp = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp, 'wb') as f:
+            yaml.dump(data, f, Dumper=Dumper, encoding='utf-8')
+        os.replace(tmp, path)
+    except BaseException:
+        # don't leave a half-written temp file next to the real one
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
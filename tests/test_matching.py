@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+import pytest
+
+from build_zone.automation_runner import load_main_module
+
+main = load_main_module()
+
+
+def _template():
+    tpl = np.full((60, 160), 255, np.uint8)
+    cv2.putText(tpl, "Logo", (8, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.6, 40, 4)
+    cv2.circle(tpl, (140, 30), 12, 120, -1)
+    return tpl
+
+
+def _scene(tpl, scale, at=(300, 200)):
+    """Light page with some distractors and tpl planted at `at`, resized by scale."""
+    img = np.full((720, 1280), 250, np.uint8)
+    cv2.putText(img, "some page text", (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 90, 2)
+    cv2.rectangle(img, (900, 500), (1200, 650), 200, -1)
+    planted = cv2.resize(tpl, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    x, y = at
+    img[y:y + planted.shape[0], x:x + planted.shape[1]] = planted
+    return img
+
+
+@pytest.mark.parametrize("scale", [0.6, 0.8, 1.0, 1.3, 1.45])
+def test_coarse_to_fine_finds_scaled_template(scale):
+    tpl = _template()
+    val, loc, (w, h) = main.coarse_to_fine_match(_scene(tpl, scale), tpl)
+    assert val > 0.95
+    assert abs(loc[0] - 300) <= 2 and abs(loc[1] - 200) <= 2
+    assert abs(w - tpl.shape[1] * scale) <= 0.03 * tpl.shape[1] * scale
+
+
+def test_geometric_scales_keep_one_and_bounds():
+    scales = main.geometric_scales(11)
+    assert len(scales) == 11
+    assert scales[0] == pytest.approx(0.5) and scales[-1] == pytest.approx(1.5)
+    assert 1.0 in scales.tolist()
+    # constant ratio on each side of 1.0
+    below, above = scales[:6], scales[5:]
+    assert np.allclose(below[1:] / below[:-1], below[1] / below[0])
+    assert np.allclose(above[1:] / above[:-1], above[1] / above[0])
+
+
+def test_sweep_scales_order_sizes_and_fit():
+    tpl = _template()
+    screenshot = np.zeros((80, 200), np.uint8)
+    scales, ws, hs = main._sweep_scales(tpl, screenshot, [0.5, 1.2, 0.9, 1.0, 1.5])
+    # nearest 1.0 first; 1.5 (240x90) does not fit and is dropped
+    assert scales.tolist() == [1.0, 0.9, 1.2, 0.5]
+    assert ws.tolist() == [int(160 * s) for s in scales.tolist()]
+    assert hs.tolist() == [int(60 * s) for s in scales.tolist()]
+
+
+def _count_steps(monkeypatch):
+    calls = []
+    step = main._match_step
+
+    def counted(*args):
+        calls.append(args[1])
+        return step(*args)
+    monkeypatch.setattr(main, "_match_step", counted)
+    monkeypatch.setattr(main, "_match_pool", lambda: None)
+    return calls
+
+
+def test_early_exit_stops_after_good_match(monkeypatch):
+    tpl = _template()
+    scene = _scene(tpl, 1.0)
+    calls = _count_steps(monkeypatch)
+    val, loc, _ = main.multi_scale_template_match(scene, tpl)
+    assert val > 0.99 and loc == (300, 200)
+    assert len(calls) == 1
+    calls.clear()
+    main.multi_scale_template_match(scene, tpl, early_exit=None)
+    assert len(calls) == len(main.DEFAULT_SCALES)
+
+
+@pytest.mark.parametrize("scale", [0.8, 1.3])
+def test_multi_scale_match_finds_scale(scale):
+    tpl = _template()
+    val, loc, (w, h) = main.multi_scale_template_match(_scene(tpl, scale), tpl, scales=[0.6, 0.8, 1.0, 1.3, 1.45])
+    assert val > 0.95
+    assert abs(loc[0] - 300) <= 2 and abs(loc[1] - 200) <= 2
+    assert abs(w - tpl.shape[1] * scale) <= 2
+
+
+def test_parallel_sweep_matches_serial(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    tpl = _template()
+    scene = _scene(tpl, 1.3)
+    serial = main.multi_scale_template_match(scene, tpl, early_exit=None)
+    pool = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(main, "_match_pool", lambda: pool)
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 3)
+    try:
+        parallel = main.multi_scale_template_match(scene, tpl, early_exit=None)
+    finally:
+        pool.shutdown()
+    assert parallel == serial
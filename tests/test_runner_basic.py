@@ -11,7 +11,113 @@ def test_eval_cond_expr():
     assert eval_cond("last_match_score >= 0.5", {"last_match_score": 0.6}) is True
 
 
+def test_eval_cond_false_and_rejected():
+    assert eval_cond("false", {}) is False
+    assert eval_cond("", {}) is False
+    # calls and attribute access are not permitted in conditions
+    assert eval_cond("__import__('os').getcwd() != ''", {}) is False
+    assert eval_cond("polling.max_attempts > 0", {"polling": {}}) is False
+
+
+def test_eval_cond_literal_membership():
+    assert eval_cond("attempts in (1, 2)", {"attempts": 2}) is True
+    assert eval_cond("attempts in [1, 2]", {"attempts": 3}) is False
+    assert eval_cond("attempts not in {1, 2}", {"attempts": 3}) is True
+    assert eval_cond("{'a': 1}[key] == 1", {"key": "a"}) is True
+
+
+def test_validate_rejects_disallowed_condition(tmp_path):
+    from build_zone.automation_runner import AutomationRunner
+
+    cfg = _write_cfg(tmp_path)
+    cfg.write_text(cfg.read_text() + "    when: 'len(vars) > 0'\n")
+    with pytest.raises(ValueError, match="action n"):
+        AutomationRunner(cfg).validate()
+
+
 def test_xdotool_fallback_none():
     # If xdotool is not present or no window, function should return None (can't assert system-specific)
     res = get_window_bbox_by_xdotool("unlikely_window_name_12345")
     assert res is None or (isinstance(res, tuple) and len(res) == 4)
+
+
+def _write_cfg(tmp_path):
+    cfg = tmp_path / "auto.yaml"
+    cfg.write_text(
+        "id: t\n"
+        "description: render test\n"
+        "target: {type: url, value: 'https://example.com'}\n"
+        "actions:\n"
+        "  - name: n\n"
+        "    type: notify\n"
+        "    params: {message: 'score {{ last_match_score }}'}\n"
+    )
+    return cfg
+
+
+def test_render_param_caches_template(tmp_path):
+    from build_zone.automation_runner import AutomationRunner
+
+    runner = AutomationRunner(_write_cfg(tmp_path))
+    runner.validate()
+    runner.last_match_score = 0.5
+    assert runner.render_param("plain") == "plain"
+    if runner.jinja_env is not None:
+        assert "score {{ last_match_score }}" in runner._tpl_cache
+        assert runner.render_param("score {{ last_match_score }}") == "score 0.5"
+
+
+def test_execute_action_keeps_template_params(tmp_path):
+    from build_zone.automation_runner import AutomationRunner, PlannedAction
+
+    runner = AutomationRunner(_write_cfg(tmp_path))
+    seen = []
+    runner._handlers["notify"] = seen.append
+    action = PlannedAction("n", "notify", "true", {"message": "score {{ last_match_score }}"})
+    runner.last_match_score = 0.25
+    runner._execute_action(action)
+    runner.last_match_score = 0.75
+    runner._execute_action(action)
+    assert len(seen) == 2
+    if runner.jinja_env is not None:
+        assert seen == [{"message": "score 0.25"}, {"message": "score 0.75"}]
+    assert action.params == {"message": "score {{ last_match_score }}"}
+
+
+def test_simple_templates_use_format_map(tmp_path):
+    from build_zone.automation_runner import AutomationRunner, simple_format_spec
+
+    assert simple_format_spec("{{ vars.logo }} #{{attempts}} {x}") == "{vars[logo]} #{attempts} {{x}}"
+    assert simple_format_spec("{{ attempts + 1 }}") is None
+    runner = AutomationRunner(_write_cfg(tmp_path))
+    runner.variables = {"logo": "data/logo.png"}
+    runner.attempts = 3
+    if runner.jinja_env is not None:
+        assert runner.render_param("{{ vars.logo }} #{{ attempts }}") == "data/logo.png #3"
+        assert runner._tpl_cache["{{ vars.logo }} #{{ attempts }}"][0] == "fmt"
+        assert runner.render_param("{{ vars.missing }}") == "{{ vars.missing }}"
+
+
+def test_runners_share_main_module(tmp_path):
+    from build_zone.automation_runner import AutomationRunner
+
+    a = AutomationRunner(_write_cfg(tmp_path))
+    b = AutomationRunner(_write_cfg(tmp_path))
+    assert a.mod is b.mod
+
+
+def test_wake_handler_ignores_own_writes():
+    from types import SimpleNamespace
+    from build_zone.automation_runner import DATA_DIR, _WakeHandler, note_own_write
+
+    hits = []
+    handler = _WakeHandler(lambda: hits.append(1))
+
+    def event(name):
+        return SimpleNamespace(is_directory=False, event_type="modified", src_path=str(DATA_DIR / name))
+
+    note_own_write(DATA_DIR / "annotated_test.png")
+    handler.dispatch(event("annotated_test.png"))
+    assert hits == []
+    handler.dispatch(event("new_template.png"))
+    assert hits == [1]